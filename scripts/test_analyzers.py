@@ -3,91 +3,72 @@
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.analyzers import CodeAnalyzer, SecurityAnalyzer, PerformanceAnalyzer, AccessibilityAnalyzer
 from pathlib import Path
 
 
-def main():
-    """Run all analyzers on the sample file."""
-    sample_file = 'test_samples/sample_code.tsx'
-    
-    print("🔍 Testing Code Analyzers on sample_code.tsx\n")
-    print("=" * 60)
-    
-    # Test Code Analyzer
-    print("\n📋 CODE QUALITY ANALYSIS:")
-    print("-" * 40)
-    code_analyzer = CodeAnalyzer()
-    code_results = code_analyzer.analyze_pr_files([sample_file])
-    
-    for check, result in code_results.items():
-        if result['issues'] > 0:
-            print(f"❌ {check}: {result['message']}")
-            if 'locations' in result:
-                for loc in result['locations'][:3]:
-                    print(f"   → {loc}")
-                if len(result.get('locations', [])) > 3:
-                    print(f"   → ... and {len(result['locations']) - 3} more")
-        else:
-            print(f"✅ {check}: {result['message']}")
-    
-    # Test Security Analyzer
-    print("\n\n🔒 SECURITY ANALYSIS:")
-    print("-" * 40)
-    security_analyzer = SecurityAnalyzer()
-    security_results = security_analyzer.analyze_pr_files([sample_file])
-    
-    for check, result in security_results.items():
-        if result['issues'] > 0:
-            print(f"❌ {check}: {result['message']}")
-            for loc in result['locations'][:3]:
-                print(f"   → {loc}")
-        else:
-            print(f"✅ {check}: {result['message']}")
-    
-    # Test Performance Analyzer
-    print("\n\n⚡ PERFORMANCE ANALYSIS:")
-    print("-" * 40)
-    performance_analyzer = PerformanceAnalyzer()
-    performance_results = performance_analyzer.analyze_pr_files([sample_file])
-    
-    for check, result in performance_results.items():
-        if result['issues'] > 0:
-            print(f"⚠️  {check}: {result['message']}")
-            for loc in result['locations'][:3]:
-                print(f"   → {loc}")
-        else:
-            print(f"✅ {check}: {result['message']}")
-    
-    # Test Accessibility Analyzer
-    print("\n\n♿ ACCESSIBILITY ANALYSIS:")
+# Section header, icon for failing checks, and analyzer class, in print order
+ANALYZERS = [
+    ("📋 CODE QUALITY ANALYSIS:", "❌", CodeAnalyzer),
+    ("🔒 SECURITY ANALYSIS:", "❌", SecurityAnalyzer),
+    ("⚡ PERFORMANCE ANALYSIS:", "⚠️ ", PerformanceAnalyzer),
+    ("♿ ACCESSIBILITY ANALYSIS:", "⚠️ ", AccessibilityAnalyzer),
+]
+
+
+def _print_results(header, icon, results):
+    """Print one analyzer's check results."""
+    print(f"\n{header}")
     print("-" * 40)
-    accessibility_analyzer = AccessibilityAnalyzer()
-    accessibility_results = accessibility_analyzer.analyze_pr_files([sample_file])
-    
-    for check, result in accessibility_results.items():
+
+    for check, result in results.items():
         if result['issues'] > 0:
-            print(f"⚠️  {check}: {result['message']}")
-            for loc in result['locations'][:3]:
+            print(f"{icon} {check}: {result['message']}")
+            locations = result.get('locations') or ()
+            for loc in locations[:3]:
                 print(f"   → {loc}")
+            remaining = len(locations) - 3
+            if remaining > 0:
+                print(f"   → ... and {remaining} more")
         else:
             print(f"✅ {check}: {result['message']}")
-    
+
+
+def main():
+    """Run all analyzers on the sample file."""
+    sample_file = 'test_samples/sample_code.tsx'
+
+    print("🔍 Testing Code Analyzers on sample_code.tsx\n")
+    print("=" * 60)
+
+    # The analyzers are independent, so run them side by side and print
+    # their results in a fixed order once they are all done
+    with ThreadPoolExecutor(max_workers=len(ANALYZERS)) as executor:
+        all_results = list(executor.map(
+            lambda analyzer_class: analyzer_class().analyze_pr_files([sample_file]),
+            [analyzer_class for _, _, analyzer_class in ANALYZERS]
+        ))
+
+    for index, ((header, icon, _), results) in enumerate(zip(ANALYZERS, all_results)):
+        if index > 0:
+            print()
+        _print_results(header, icon, results)
+
     # Summary
     print("\n\n📊 SUMMARY:")
     print("-" * 40)
-    
-    total_issues = 0
-    for results in [code_results, security_results, performance_results, accessibility_results]:
-        for check, result in results.items():
-            total_issues += result['issues']
-    
+
+    total_issues = sum(
+        result['issues'] for results in all_results for result in results.values()
+    )
+
     print(f"Total issues found: {total_issues}")
     print("\nThis sample file was designed to trigger various analyzers.")
     print("In a real PR review, you would see these issues flagged for fixing.")
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
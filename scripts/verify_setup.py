@@ -2,11 +2,18 @@
 """Verify MVP setup"""
 import os
 import sys
+from importlib.util import find_spec
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Maps a project name like "my-app" to its env var prefix "MY_APP"
+_ENV_PREFIX = str.maketrans(
+    '-abcdefghijklmnopqrstuvwxyz',
+    '_ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+)
+
 def check_env_vars():
     """Check required environment variables"""
     print("🔍 Checking environment variables...")
@@ -31,7 +38,7 @@ def check_env_vars():
     # Check for project-specific GitHub repo
     target_project = os.getenv("TARGET_PROJECT", "")
     if target_project:
-        repo_env_var = f"{target_project.upper().replace('-', '_')}_GITHUB_REPO"
+        repo_env_var = f"{target_project.translate(_ENV_PREFIX)}_GITHUB_REPO"
         github_repo = os.getenv(repo_env_var, "")
         if github_repo and "/" in github_repo:
             print(f"✅ {repo_env_var} is set to {github_repo}")
@@ -57,10 +64,11 @@ def check_imports():
     
     all_good = True
     for package in packages:
-        try:
-            __import__(package)
+        # Locate the package without executing it; importing PyGithub and
+        # friends just to check they exist dominates the script's runtime.
+        if find_spec(package) is not None:
             print(f"✅ {package} installed")
-        except ImportError:
+        else:
             print(f"❌ {package} missing - run 'pip install -r requirements.txt'")
             all_good = False
     
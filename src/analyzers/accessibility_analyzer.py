@@ -1,10 +1,93 @@
 """Accessibility analyzer for detecting a11y issues."""
 
 import re
+from itertools import accumulate
 from typing import Dict, List, Any
 from pathlib import Path
 from loguru import logger
 
+from ..utils.cache import ResultCache, cached_map, results_dir
+from ..utils.files import content_key, read_source
+
+# Only JSX files have markup
+_EXTENSIONS = ('.tsx', '.jsx')
+
+# Interactive elements missing ARIA labels. The patterns are lowercase and
+# run against the lowercased line, which is cheaper than re.IGNORECASE.
+_ARIA_PATTERNS = tuple(re.compile(p) for p in [
+    r'<button[^>]*>(?:(?!aria-label|aria-labelledby|children).)*<\/button>',  # Empty buttons
+    r'<a[^>]*><\/a>',                                                         # Empty links
+    r'role="button"(?!.*aria-label)',                                        # Role button without label
+    r'<iconbutton(?!.*aria-label)',                                          # Icon buttons
+])
+
+# Low contrast color combinations
+_LOW_CONTRAST_PATTERNS = tuple(re.compile(p) for p in [
+    r'color:\s*[\'"]?#[cdefCDEF][0-9a-fA-F]{5}',     # Very light colors
+    r'color:\s*[\'"]?#[0-3][0-9a-fA-F]{5}',          # Very dark colors on dark
+    r'text-(gray|grey)-(300|400)',                    # Light gray text (Tailwind)
+    r'opacity-[0-5]0',                                 # Low opacity text
+])
+
+_HEADING_RE = re.compile(r'<h([1-6])[^>]*>')
+
+_INPUT_TYPES = ('input', 'select', 'textarea')
+
+# Every line-based check needs at least one of these substrings on the line,
+# so lines without any of them can be skipped with a single search
+_INTEREST_RE = re.compile(
+    r'<img|<Image|(?i:button|<a)|<input|<select|<textarea'
+    r'|color:|text-gr[ae]y-|opacity-|onClick|onMouseDown'
+    r'|outline-none|outline: none|autoFocus|<div|class(?:Name)?="list"'
+)
+
+
+# Lowercased substrings covering every _INTEREST_RE match. Plain substring
+# search over a whole file is far cheaper than the regex, so this decides
+# whether a file needs the line scan at all.
+_INTEREST_TOKENS = (
+    '<img', '<image', 'button', '<a', '<input', '<select', '<textarea',
+    'color:', 'text-gray-', 'text-grey-', 'opacity-', 'onclick', 'onmousedown',
+    'outline-none', 'outline: none', 'autofocus', '<div', 'class="list"',
+    'classname="list"',
+)
+
+
+# Checks in report order
+_CHECKS = (
+    'missing_alt_text',
+    'missing_aria_labels',
+    'missing_form_labels',
+    'color_contrast',
+    'interactive_elements',
+    'heading_hierarchy',
+    'focus_management',
+    'semantic_html',
+)
+
+# Per-check messages; issue messages are formatted with the issue count
+_ISSUE_MESSAGES = {
+    'missing_alt_text': 'Found {count} images missing alt text',
+    'missing_aria_labels': 'Found {count} elements missing ARIA labels',
+    'missing_form_labels': 'Found {count} form inputs without labels',
+    'color_contrast': 'Found {count} potential color contrast issues',
+    'interactive_elements': 'Found {count} non-accessible interactive elements',
+    'heading_hierarchy': 'Found {count} heading hierarchy issues',
+    'focus_management': 'Found {count} focus management issues',
+    'semantic_html': 'Found {count} non-semantic HTML elements',
+}
+
+_PASS_MESSAGES = {
+    'missing_alt_text': 'All images have alt text',
+    'missing_aria_labels': 'Interactive elements have proper labels',
+    'missing_form_labels': 'All form inputs have labels',
+    'color_contrast': 'No obvious color contrast issues',
+    'interactive_elements': 'Interactive elements are accessible',
+    'heading_hierarchy': 'Heading hierarchy is correct',
+    'focus_management': 'Focus indicators are preserved',
+    'semantic_html': 'Semantic HTML is used appropriately',
+}
+
 
 class AccessibilityAnalyzer:
     """Analyzes code for accessibility issues."""
@@ -12,37 +95,30 @@ class AccessibilityAnalyzer:
     def __init__(self, repo_path: str = "."):
         """Initialize analyzer with repository path."""
         self.repo_path = Path(repo_path)
+        # Per-file results, keyed by content hash so edits invalidate them and
+        # persisted so later runs of the CLI reuse them
+        self._file_cache = ResultCache(directory=results_dir(__file__))
         
     def analyze_pr_files(self, changed_files: List[str]) -> Dict[str, Any]:
         """Analyze changed files for accessibility issues."""
         all_results = {
-            'missing_alt_text': {'status': 'pass', 'issues': 0, 'locations': []},
-            'missing_aria_labels': {'status': 'pass', 'issues': 0, 'locations': []},
-            'missing_form_labels': {'status': 'pass', 'issues': 0, 'locations': []},
-            'color_contrast': {'status': 'pass', 'issues': 0, 'locations': []},
-            'interactive_elements': {'status': 'pass', 'issues': 0, 'locations': []},
-            'heading_hierarchy': {'status': 'pass', 'issues': 0, 'locations': []},
-            'focus_management': {'status': 'pass', 'issues': 0, 'locations': []},
-            'semantic_html': {'status': 'pass', 'issues': 0, 'locations': []},
+            check: {'status': 'pass', 'issues': 0, 'locations': []} for check in _CHECKS
         }
         
-        for file in changed_files:
-            if not self._should_analyze_file(file):
-                continue
-                
-            file_path = self.repo_path / file
-            if not file_path.exists():
-                continue
-                
-            # Run accessibility checks
-            file_results = self._analyze_file(file_path)
-            
+        files = [
+            file for file in changed_files
+            if self._should_analyze_file(file) and (self.repo_path / file).exists()
+        ]
+        
+        # Run accessibility checks
+        file_paths = [self.repo_path / file for file in files]
+        for file, file_results in zip(files, self._analyze_files(file_paths)):
             # Aggregate results
             for check, result in file_results.items():
                 if result['issues'] > 0:
                     all_results[check]['issues'] += result['issues']
                     all_results[check]['locations'].extend(
-                        [f"{file}:{loc}" for loc in result['locations']]
+                        f"{file}:{loc}" for loc in result['locations']
                     )
         
         # Update statuses and messages
@@ -58,81 +134,87 @@ class AccessibilityAnalyzer:
     
     def _should_analyze_file(self, file_path: str) -> bool:
         """Check if file should be analyzed."""
-        extensions = ['.tsx', '.jsx']  # Only JSX files have markup
-        return any(file_path.endswith(ext) for ext in extensions)
+        return file_path.endswith(_EXTENSIONS)
+    
+    def _analyze_files(self, file_paths: List[Path]) -> List[Dict[str, Any]]:
+        """Analyze several files, spreading uncached ones over worker processes."""
+        return cached_map(self._file_cache, content_key, _scan_file, file_paths)
     
     def _analyze_file(self, file_path: Path) -> Dict[str, Any]:
         """Analyze a single file for accessibility issues."""
+        return self._analyze_files([file_path])[0]
+    
+    def _scan_file(self, file_path: Path) -> Dict[str, Any]:
+        """Run all accessibility checks on a file, bypassing the cache."""
         results = {}
         
         try:
-            with open(file_path, 'r') as f:
-                content = f.read()
-                lines = content.split('\n')
-                
-            results['missing_alt_text'] = self._check_missing_alt_text(lines)
-            results['missing_aria_labels'] = self._check_missing_aria_labels(lines)
-            results['missing_form_labels'] = self._check_missing_form_labels(lines)
-            results['color_contrast'] = self._check_color_contrast(lines)
-            results['interactive_elements'] = self._check_interactive_elements(lines)
+            content = read_source(file_path)
+            
+            # All line-based checks share a single pass over the file. Files
+            # with no markup they look at, like hooks and utilities, have no
+            # lines to scan.
+            lowered = content.lower()
+            has_markup = any(token in lowered for token in _INTEREST_TOKENS)
+            lines = content.split('\n') if has_markup else []
+            for check, locations in self._scan_lines(lines).items():
+                results[check] = {'issues': len(locations), 'locations': locations}
             results['heading_hierarchy'] = self._check_heading_hierarchy(content)
-            results['focus_management'] = self._check_focus_management(lines)
-            results['semantic_html'] = self._check_semantic_html(lines)
             
         except Exception as e:
             logger.error(f"Error analyzing {file_path}: {e}")
             
         return results
     
-    def _check_missing_alt_text(self, lines: List[str]) -> Dict[str, Any]:
-        """Check for images missing alt text."""
-        locations = []
+    def _scan_lines(self, lines: List[str]) -> Dict[str, List[str]]:
+        """Run every line-based check in one pass over the lines.
+        
+        Returns the locations found by each line-based check, keyed by check name.
+        """
+        alt_text: List[str] = []
+        aria_labels: List[str] = []
+        form_labels: List[str] = []
+        color_contrast: List[str] = []
+        interactive: List[str] = []
+        focus: List[str] = []
+        semantic: List[str] = []
+        # Running count of '<label' lines, built on the first unlabeled input
+        label_counts = None
         
         for i, line in enumerate(lines, 1):
-            # Check for img tags without alt
-            if '<img' in line and 'alt=' not in line:
+            if not _INTEREST_RE.search(line):
+                continue
+                
+            # Substrings several checks test for, looked up once per line
+            lower = line.lower()
+            has_alt = 'alt=' in line
+            has_div = '<div' in line
+            has_on_click = 'onClick' in line
+            
+            # Images missing alt text
+            if '<img' in line and not has_alt:
                 # Make sure it's not a multi-line tag
                 if '>' in line or '/>' in line:
-                    locations.append(f"line {i}")
+                    alt_text.append(f"line {i}")
                     
-            # Check for Next.js Image component without alt
-            if '<Image' in line and 'alt=' not in line:
+            # Next.js Image component without alt
+            if '<Image' in line and not has_alt:
                 if '/>' in line:  # Self-closing
-                    locations.append(f"line {i}")
+                    alt_text.append(f"line {i}")
                     
-        return {'issues': len(locations), 'locations': locations}
-    
-    def _check_missing_aria_labels(self, lines: List[str]) -> Dict[str, Any]:
-        """Check for interactive elements missing ARIA labels."""
-        patterns = [
-            r'<button[^>]*>(?:(?!aria-label|aria-labelledby|children).)*<\/button>',  # Empty buttons
-            r'<a[^>]*><\/a>',                                                         # Empty links
-            r'role="button"(?!.*aria-label)',                                        # Role button without label
-            r'<IconButton(?!.*aria-label)',                                          # Icon buttons
-        ]
-        
-        locations = []
-        for i, line in enumerate(lines, 1):
-            # Check for icon-only buttons
-            if 'button' in line.lower() and 'icon' in line.lower():
+            # Icon-only buttons
+            if 'button' in lower and 'icon' in lower:
                 if 'aria-label' not in line and 'title=' not in line:
-                    locations.append(f"line {i} - icon button needs aria-label")
+                    aria_labels.append(f"line {i} - icon button needs aria-label")
                     
-            # Check for empty interactive elements
-            for pattern in patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    locations.append(f"line {i}")
+            # Empty interactive elements
+            for pattern in _ARIA_PATTERNS:
+                if pattern.search(lower):
+                    aria_labels.append(f"line {i}")
                     break
                     
-        return {'issues': len(locations), 'locations': locations}
-    
-    def _check_missing_form_labels(self, lines: List[str]) -> Dict[str, Any]:
-        """Check for form inputs missing labels."""
-        input_types = ['input', 'select', 'textarea']
-        locations = []
-        
-        for i, line in enumerate(lines, 1):
-            for input_type in input_types:
+            # Form inputs missing labels
+            for input_type in _INPUT_TYPES:
                 if f'<{input_type}' in line:
                     # Check if it has label association
                     has_label = any(attr in line for attr in ['aria-label=', 'aria-labelledby=', 'id='])
@@ -143,72 +225,115 @@ class AccessibilityAnalyzer:
                         
                     if not has_label:
                         # Look for associated label in nearby lines
-                        label_found = False
-                        for j in range(max(0, i-5), min(len(lines), i+5)):
-                            if '<label' in lines[j]:
-                                label_found = True
-                                break
+                        if label_counts is None:
+                            label_counts = list(accumulate(
+                                ('<label' in text for text in lines), initial=0
+                            ))
+                        label_found = label_counts[min(len(lines), i+5)] > label_counts[max(0, i-5)]
                                 
                         if not label_found:
-                            locations.append(f"line {i} - {input_type} without label")
+                            form_labels.append(f"line {i} - {input_type} without label")
                             
-        return {'issues': len(locations), 'locations': locations}
-    
-    def _check_color_contrast(self, lines: List[str]) -> Dict[str, Any]:
-        """Check for potential color contrast issues."""
-        locations = []
-        
-        # Look for low contrast color combinations
-        low_contrast_patterns = [
-            r'color:\s*[\'"]?#[cdefCDEF][0-9a-fA-F]{5}',     # Very light colors
-            r'color:\s*[\'"]?#[0-3][0-9a-fA-F]{5}',          # Very dark colors on dark
-            r'text-(gray|grey)-(300|400)',                    # Light gray text (Tailwind)
-            r'opacity-[0-5]0',                                 # Low opacity text
-        ]
-        
-        for i, line in enumerate(lines, 1):
-            for pattern in low_contrast_patterns:
-                if re.search(pattern, line):
+            # Potential color contrast issues
+            for pattern in _LOW_CONTRAST_PATTERNS:
+                if pattern.search(line):
                     # Check if it's text content
-                    if any(text_el in line for text_el in ['<p', '<span', '<div', '<h', '<a']):
-                        locations.append(f"line {i} - potential low contrast")
+                    if has_div or any(text_el in line for text_el in ['<p', '<span', '<h', '<a']):
+                        color_contrast.append(f"line {i} - potential low contrast")
                         break
                         
-        return {'issues': len(locations), 'locations': locations}
-    
-    def _check_interactive_elements(self, lines: List[str]) -> Dict[str, Any]:
-        """Check for non-semantic interactive elements."""
-        locations = []
-        
-        for i, line in enumerate(lines, 1):
             # Divs with onClick
-            if '<div' in line and 'onClick' in line:
+            if has_div and has_on_click:
                 if 'role=' not in line and 'tabIndex' not in line:
-                    locations.append(f"line {i} - div with onClick needs role and tabIndex")
+                    interactive.append(f"line {i} - div with onClick needs role and tabIndex")
                     
             # Spans with onClick
-            if '<span' in line and 'onClick' in line:
-                locations.append(f"line {i} - use button instead of span with onClick")
+            if has_on_click and '<span' in line:
+                interactive.append(f"line {i} - use button instead of span with onClick")
                 
             # Missing keyboard handlers
             if 'onMouseDown' in line and 'onKeyDown' not in line:
-                locations.append(f"line {i} - mouse event without keyboard equivalent")
+                interactive.append(f"line {i} - mouse event without keyboard equivalent")
                 
+            # Outline removal without alternative
+            if 'outline-none' in line or 'outline: none' in line:
+                # Check if there's a focus style
+                if 'focus:' not in line and ':focus' not in lines[max(0, i-3):i+3]:
+                    focus.append(f"line {i} - outline removed without focus indicator")
+                    
+            # Autofocus on page load
+            if 'autoFocus' in line and 'Modal' not in line and 'Dialog' not in line:
+                focus.append(f"line {i} - avoid autoFocus on page load")
+                
+            # Divs that should be semantic elements
+            if has_div:
+                # Navigation areas
+                if 'navigation' in lower or 'nav-' in line:
+                    if '<nav' not in line:
+                        semantic.append(f"line {i} - use <nav> for navigation")
+                        
+                # Main content
+                if 'main-content' in line or 'id="main"' in line:
+                    if '<main' not in line:
+                        semantic.append(f"line {i} - use <main> for main content")
+                        
+            # Lists without semantic markup
+            if 'className="list"' in line or 'class="list"' in line:
+                if '<ul' not in line and '<ol' not in line:
+                    semantic.append(f"line {i} - use <ul> or <ol> for lists")
+                    
+        return {
+            'missing_alt_text': alt_text,
+            'missing_aria_labels': aria_labels,
+            'missing_form_labels': form_labels,
+            'color_contrast': color_contrast,
+            'interactive_elements': interactive,
+            'focus_management': focus,
+            'semantic_html': semantic,
+        }
+    
+    def _line_check(self, lines: List[str], check: str) -> Dict[str, Any]:
+        """Get the result of a single line-based check."""
+        locations = self._scan_lines(lines)[check]
         return {'issues': len(locations), 'locations': locations}
     
+    def _check_missing_alt_text(self, lines: List[str]) -> Dict[str, Any]:
+        """Check for images missing alt text."""
+        return self._line_check(lines, 'missing_alt_text')
+    
+    def _check_missing_aria_labels(self, lines: List[str]) -> Dict[str, Any]:
+        """Check for interactive elements missing ARIA labels."""
+        return self._line_check(lines, 'missing_aria_labels')
+    
+    def _check_missing_form_labels(self, lines: List[str]) -> Dict[str, Any]:
+        """Check for form inputs missing labels."""
+        return self._line_check(lines, 'missing_form_labels')
+    
+    def _check_color_contrast(self, lines: List[str]) -> Dict[str, Any]:
+        """Check for potential color contrast issues."""
+        return self._line_check(lines, 'color_contrast')
+    
+    def _check_interactive_elements(self, lines: List[str]) -> Dict[str, Any]:
+        """Check for non-semantic interactive elements."""
+        return self._line_check(lines, 'interactive_elements')
+    
     def _check_heading_hierarchy(self, content: str) -> Dict[str, Any]:
         """Check for proper heading hierarchy."""
         locations = []
         
-        # Find all headings
-        heading_pattern = re.compile(r'<h([1-6])[^>]*>')
-        headings = [(m.group(1), m.start()) for m in heading_pattern.finditer(content)]
+        # Find all headings; they come in order, so each line number only
+        # needs the newlines since the previous heading
+        headings = []
+        line_num, last_pos = 1, 0
+        for m in _HEADING_RE.finditer(content):
+            line_num += content.count('\n', last_pos, m.start())
+            last_pos = m.start()
+            headings.append((m.group(1), line_num))
         
         if headings:
             # Check if starts with h1
             if headings[0][0] != '1':
-                line_num = content[:headings[0][1]].count('\n') + 1
-                locations.append(f"line {line_num} - page should start with h1")
+                locations.append(f"line {headings[0][1]} - page should start with h1")
                 
             # Check for skipped levels
             for i in range(1, len(headings)):
@@ -216,76 +341,27 @@ class AccessibilityAnalyzer:
                 curr_level = int(headings[i][0])
                 
                 if curr_level > prev_level + 1:
-                    line_num = content[:headings[i][1]].count('\n') + 1
-                    locations.append(f"line {line_num} - skipped heading level")
+                    locations.append(f"line {headings[i][1]} - skipped heading level")
                     
         return {'issues': len(locations), 'locations': locations}
     
     def _check_focus_management(self, lines: List[str]) -> Dict[str, Any]:
         """Check for focus management issues."""
-        locations = []
-        
-        for i, line in enumerate(lines, 1):
-            # Check for outline removal without alternative
-            if 'outline-none' in line or 'outline: none' in line:
-                # Check if there's a focus style
-                if 'focus:' not in line and ':focus' not in lines[max(0, i-3):i+3]:
-                    locations.append(f"line {i} - outline removed without focus indicator")
-                    
-            # Check for autofocus on page load
-            if 'autoFocus' in line and 'Modal' not in line and 'Dialog' not in line:
-                locations.append(f"line {i} - avoid autoFocus on page load")
-                
-        return {'issues': len(locations), 'locations': locations}
+        return self._line_check(lines, 'focus_management')
     
     def _check_semantic_html(self, lines: List[str]) -> Dict[str, Any]:
         """Check for non-semantic HTML usage."""
-        locations = []
-        
-        for i, line in enumerate(lines, 1):
-            # Check for divs that should be semantic elements
-            if '<div' in line:
-                # Navigation areas
-                if 'navigation' in line.lower() or 'nav-' in line:
-                    if '<nav' not in line:
-                        locations.append(f"line {i} - use <nav> for navigation")
-                        
-                # Main content
-                if 'main-content' in line or 'id="main"' in line:
-                    if '<main' not in line:
-                        locations.append(f"line {i} - use <main> for main content")
-                        
-            # Lists without semantic markup
-            if 'className="list"' in line or 'class="list"' in line:
-                if '<ul' not in line and '<ol' not in line:
-                    locations.append(f"line {i} - use <ul> or <ol> for lists")
-                    
-        return {'issues': len(locations), 'locations': locations}
+        return self._line_check(lines, 'semantic_html')
     
     def _get_issue_message(self, check: str, count: int) -> str:
         """Get issue message for an accessibility check."""
-        messages = {
-            'missing_alt_text': f'Found {count} images missing alt text',
-            'missing_aria_labels': f'Found {count} elements missing ARIA labels',
-            'missing_form_labels': f'Found {count} form inputs without labels',
-            'color_contrast': f'Found {count} potential color contrast issues',
-            'interactive_elements': f'Found {count} non-accessible interactive elements',
-            'heading_hierarchy': f'Found {count} heading hierarchy issues',
-            'focus_management': f'Found {count} focus management issues',
-            'semantic_html': f'Found {count} non-semantic HTML elements',
-        }
-        return messages.get(check, f'Found {count} accessibility issues')
+        return _ISSUE_MESSAGES.get(check, 'Found {count} accessibility issues').format(count=count)
     
     def _get_pass_message(self, check: str) -> str:
         """Get pass message for an accessibility check."""
-        messages = {
-            'missing_alt_text': 'All images have alt text',
-            'missing_aria_labels': 'Interactive elements have proper labels',
-            'missing_form_labels': 'All form inputs have labels',
-            'color_contrast': 'No obvious color contrast issues',
-            'interactive_elements': 'Interactive elements are accessible',
-            'heading_hierarchy': 'Heading hierarchy is correct',
-            'focus_management': 'Focus indicators are preserved',
-            'semantic_html': 'Semantic HTML is used appropriately',
-        }
-        return messages.get(check, 'Accessibility check passed') 
\ No newline at end of file
+        return _PASS_MESSAGES.get(check, 'Accessibility check passed')
+
+
+def _scan_file(file_path: Path) -> Dict[str, Any]:
+    """Process pool entry point; the checks only depend on the file itself."""
+    return AccessibilityAnalyzer()._scan_file(file_path)
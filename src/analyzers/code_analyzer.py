@@ -3,10 +3,68 @@
 import re
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple, Any
 from pathlib import Path
 from loguru import logger
 
+from ..utils.cache import ResultCache, cached_map, results_dir
+from ..utils.files import content_key, read_source
+
+
+# Only analyze TypeScript/JavaScript files
+_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx')
+
+# Statements that should not ship
+_CONSOLE_RE = re.compile(r'console\.(log|error|warn|info|debug)\s*\(')
+_TODO_RE = re.compile(r'(TODO|FIXME|HACK|XXX|BUG):', re.IGNORECASE)
+_TODO_LOWER_RE = re.compile(r'(todo|fixme|hack|xxx|bug):')
+
+# Function declarations, found anywhere in a file's content
+_FUNC_DECL_RE = re.compile(
+    r'(?:function\s+(\w+)|(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s*)?\([^)]*\)\s*=>)',
+    re.MULTILINE
+)
+
+# Lines that start a function: declarations, arrow functions and methods
+_FUNC_LINE_RES = (
+    re.compile(r'(?:export\s+)?(?:async\s+)?function\s+\w+'),
+    re.compile(r'(?:const|let|var)\s+\w+\s*=\s*(?:async\s*)?\([^)]*\)\s*=>'),
+    re.compile(r'\w+\s*\([^)]*\)\s*{'),
+)
+_FUNC_NAME_RE = re.compile(r'(?:function\s+)?(\w+)')
+_BRACE_RE = re.compile(r'[{}]')
+
+# Decision points counted towards a function's complexity. Ternaries are
+# counted separately: a ternary match spans the branch text, which may
+# itself contain keywords that are counted too.
+_DECISION_RE = re.compile(r'\b(?:if|else|for|while|case|catch)\b')
+_TERNARY_RE = re.compile(r'\?\s*[^:]+\s*:')
+
+
+# Per-check messages; issue messages are formatted with the issue count
+_ISSUE_MESSAGES = {
+    'console_logs': 'Found {count} console.log statements',
+    'complexity': 'Found {count} complex functions',
+    'todos': 'Found {count} TODO comments',
+    'formatting': 'Found {count} formatting issues',
+    'linting': 'Found {count} linting errors',
+    'type_checking': 'Found {count} TypeScript errors',
+    'long_lines': 'Found {count} lines over 120 characters',
+    'large_functions': 'Found {count} functions over 50 lines',
+}
+
+_PASS_MESSAGES = {
+    'console_logs': 'No console.log statements',
+    'complexity': 'All functions have acceptable complexity',
+    'todos': 'No TODO comments',
+    'formatting': 'Code is properly formatted',
+    'linting': 'No linting errors',
+    'type_checking': 'No TypeScript errors',
+    'long_lines': 'All lines within length limit',
+    'large_functions': 'All functions are reasonably sized',
+}
+
 
 class CodeAnalyzer:
     """Analyzes code for quality issues."""
@@ -14,21 +72,34 @@ class CodeAnalyzer:
     def __init__(self, repo_path: str = "."):
         """Initialize analyzer with repository path."""
         self.repo_path = Path(repo_path)
+        # Per-file results, keyed by content hash so edits invalidate them and
+        # persisted so later runs of the CLI reuse them
+        self._file_cache = ResultCache(directory=results_dir(__file__))
         
     def analyze_file(self, file_path: Path) -> Dict[str, Any]:
         """Analyze a single file for issues."""
+        return self._analyze_files([file_path])[0]
+    
+    def _analyze_files(self, file_paths: List[Path]) -> List[Dict[str, Any]]:
+        """Analyze several files, spreading uncached ones over worker processes."""
+        return cached_map(self._file_cache, content_key, _scan_file, file_paths)
+    
+    def _scan_file(self, file_path: Path) -> Dict[str, Any]:
+        """Run all per-file checks, bypassing the cache."""
+        # Console logs, TODOs and long lines share a single pass over the file
+        line_results = self._scan_lines(file_path)
         results = {
-            'console_logs': self._check_console_logs(file_path),
+            'console_logs': line_results['console_logs'],
             'complexity': self._check_complexity(file_path),
-            'todos': self._check_todos(file_path),
-            'long_lines': self._check_line_length(file_path),
+            'todos': line_results['todos'],
+            'long_lines': line_results['long_lines'],
             'large_functions': self._check_function_size(file_path)
         }
         return results
     
     def analyze_pr_files(self, changed_files: List[str]) -> Dict[str, Any]:
         """Analyze all changed files in a PR."""
-        all_results = {
+        all_results: Dict[str, Dict[str, Any]] = {
             'console_logs': {'status': 'pass', 'issues': 0, 'locations': []},
             'complexity': {'status': 'pass', 'issues': 0, 'details': []},
             'todos': {'status': 'pass', 'issues': 0, 'locations': []},
@@ -39,34 +110,36 @@ class CodeAnalyzer:
             'large_functions': {'status': 'pass', 'issues': 0, 'details': []}
         }
         
+        files = [
+            file for file in changed_files
+            if self._should_analyze_file(file) and (self.repo_path / file).exists()
+        ]
+        
         # Check each file
-        for file in changed_files:
-            if not self._should_analyze_file(file):
-                continue
-                
-            file_path = self.repo_path / file
-            if not file_path.exists():
-                continue
-                
-            file_results = self.analyze_file(file_path)
-            
+        file_paths = [self.repo_path / file for file in files]
+        for file, file_results in zip(files, self._analyze_files(file_paths)):
             # Aggregate results
             for check, result in file_results.items():
                 if check in all_results and result['issues'] > 0:
                     all_results[check]['issues'] += result['issues']
                     if 'locations' in result:
-                        all_results[check].setdefault('locations', []).extend(
-                            [f"{file}:{loc}" for loc in result['locations']]
+                        all_results[check]['locations'].extend(
+                            f"{file}:{loc}" for loc in result['locations']
                         )
                     if 'details' in result:
-                        all_results[check].setdefault('details', []).extend(
-                            [{**detail, 'file': file} for detail in result['details']]
+                        all_results[check]['details'].extend(
+                            {**detail, 'file': file} for detail in result['details']
                         )
         
-        # Run project-wide checks
-        all_results['formatting'] = self._check_formatting()
-        all_results['linting'] = self._check_linting()
-        all_results['type_checking'] = self._check_type_checking()
+        # Run project-wide checks. Each one mostly waits on its own npx
+        # process, so they run side by side.
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            formatting = executor.submit(self._check_formatting)
+            linting = executor.submit(self._check_linting)
+            type_checking = executor.submit(self._check_type_checking)
+        all_results['formatting'] = formatting.result()
+        all_results['linting'] = linting.result()
+        all_results['type_checking'] = type_checking.result()
         
         # Update statuses based on issue counts
         for check, result in all_results.items():
@@ -77,22 +150,7 @@ class CodeAnalyzer:
                     result['status'] = 'warning'
                     
                 # Add messages
-                if check == 'console_logs':
-                    result['message'] = f"Found {result['issues']} console.log statements"
-                elif check == 'complexity':
-                    result['message'] = f"Found {result['issues']} complex functions"
-                elif check == 'todos':
-                    result['message'] = f"Found {result['issues']} TODO comments"
-                elif check == 'formatting':
-                    result['message'] = f"Found {result['issues']} formatting issues"
-                elif check == 'linting':
-                    result['message'] = f"Found {result['issues']} linting errors"
-                elif check == 'type_checking':
-                    result['message'] = f"Found {result['issues']} TypeScript errors"
-                elif check == 'long_lines':
-                    result['message'] = f"Found {result['issues']} lines over 120 characters"
-                elif check == 'large_functions':
-                    result['message'] = f"Found {result['issues']} functions over 50 lines"
+                result['message'] = self._get_issue_message(check, result['issues'])
             else:
                 result['message'] = self._get_pass_message(check)
                 
@@ -100,30 +158,11 @@ class CodeAnalyzer:
     
     def _should_analyze_file(self, file_path: str) -> bool:
         """Check if file should be analyzed."""
-        # Only analyze TypeScript/JavaScript files
-        extensions = ['.ts', '.tsx', '.js', '.jsx']
-        return any(file_path.endswith(ext) for ext in extensions)
+        return file_path.endswith(_EXTENSIONS)
     
     def _check_console_logs(self, file_path: Path) -> Dict[str, Any]:
         """Check for console.log statements."""
-        pattern = re.compile(r'console\.(log|error|warn|info|debug)\s*\(')
-        locations = []
-        
-        try:
-            with open(file_path, 'r') as f:
-                for line_num, line in enumerate(f, 1):
-                    if pattern.search(line):
-                        # Skip if it's commented out
-                        stripped = line.strip()
-                        if not stripped.startswith('//') and not stripped.startswith('*'):
-                            locations.append(f"line {line_num}")
-        except Exception as e:
-            logger.error(f"Error checking console logs in {file_path}: {e}")
-            
-        return {
-            'issues': len(locations),
-            'locations': locations
-        }
+        return self._scan_lines(file_path)['console_logs']
     
     def _check_complexity(self, file_path: Path) -> Dict[str, Any]:
         """Check cyclomatic complexity of functions."""
@@ -132,46 +171,23 @@ class CodeAnalyzer:
         complex_functions = []
         
         try:
-            with open(file_path, 'r') as f:
-                content = f.read()
+            content = read_source(file_path)
                 
             # Find function declarations
-            func_pattern = re.compile(
-                r'(?:function\s+(\w+)|(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s*)?\([^)]*\)\s*=>)',
-                re.MULTILINE
-            )
-            
-            for match in func_pattern.finditer(content):
+            for match in _FUNC_DECL_RE.finditer(content):
                 func_name = match.group(1) or match.group(2)
                 func_start = match.start()
                 
                 # Extract function body (simplified)
-                brace_count = 0
-                func_end = func_start
-                in_function = False
-                
-                for i, char in enumerate(content[func_start:], func_start):
-                    if char == '{':
-                        brace_count += 1
-                        in_function = True
-                    elif char == '}':
-                        brace_count -= 1
-                        if brace_count == 0 and in_function:
-                            func_end = i
-                            break
+                func_end = self._find_block_end(content, func_start)
                 
                 if func_end > func_start:
                     func_body = content[func_start:func_end]
                     
                     # Count complexity indicators
                     complexity = 1  # Base complexity
-                    complexity += len(re.findall(r'\bif\b', func_body))
-                    complexity += len(re.findall(r'\belse\b', func_body))
-                    complexity += len(re.findall(r'\bfor\b', func_body))
-                    complexity += len(re.findall(r'\bwhile\b', func_body))
-                    complexity += len(re.findall(r'\bcase\b', func_body))
-                    complexity += len(re.findall(r'\bcatch\b', func_body))
-                    complexity += len(re.findall(r'\?\s*[^:]+\s*:', func_body))  # Ternary
+                    complexity += len(_DECISION_RE.findall(func_body))
+                    complexity += len(_TERNARY_RE.findall(func_body))
                     
                     if complexity > complexity_threshold:
                         line_num = content[:func_start].count('\n') + 1
@@ -189,39 +205,83 @@ class CodeAnalyzer:
             'details': complex_functions
         }
     
+    def _find_block_end(self, content: str, start: int) -> int:
+        """Find the brace closing the first block opened at or after start.
+        
+        Returns start if no block closes. Only the braces are visited, so the
+        text between them is skipped by the regex engine.
+        """
+        brace_count = 0
+        in_block = False
+        
+        for match in _BRACE_RE.finditer(content, start):
+            if match.group() == '{':
+                brace_count += 1
+                in_block = True
+            else:
+                brace_count -= 1
+                if brace_count == 0 and in_block:
+                    return match.start()
+                    
+        return start
+    
     def _check_todos(self, file_path: Path) -> Dict[str, Any]:
         """Check for TODO comments."""
-        pattern = re.compile(r'(TODO|FIXME|HACK|XXX|BUG):', re.IGNORECASE)
-        locations = []
-        
-        try:
-            with open(file_path, 'r') as f:
-                for line_num, line in enumerate(f, 1):
-                    if pattern.search(line):
-                        locations.append(f"line {line_num}")
-        except Exception as e:
-            logger.error(f"Error checking TODOs in {file_path}: {e}")
-            
-        return {
-            'issues': len(locations),
-            'locations': locations
-        }
+        return self._scan_lines(file_path)['todos']
     
     def _check_line_length(self, file_path: Path, max_length: int = 120) -> Dict[str, Any]:
         """Check for lines exceeding maximum length."""
+        return self._scan_lines(file_path, max_length)['long_lines']
+    
+    def _scan_lines(self, file_path: Path, max_length: int = 120) -> Dict[str, Dict[str, Any]]:
+        """Run the console.log, TODO and line length checks in one pass.
+        
+        Returns each check's results keyed by check name.
+        """
+        console_logs = []
+        todos = []
         long_lines = []
         
         try:
-            with open(file_path, 'r') as f:
-                for line_num, line in enumerate(f, 1):
-                    if len(line.rstrip()) > max_length:
-                        long_lines.append(f"line {line_num} ({len(line.rstrip())} chars)")
+            content = read_source(file_path)
         except Exception as e:
-            logger.error(f"Error checking line length in {file_path}: {e}")
+            logger.error(f"Error scanning lines in {file_path}: {e}")
+            content = ''
             
+        # Case-insensitive matching is slow. On ASCII text, where lowering is
+        # exact, lowercase markers are matched against a lowercased copy.
+        if content.isascii():
+            todo_pattern, todo_text = _TODO_LOWER_RE, content.lower()
+        else:
+            todo_pattern, todo_text = _TODO_RE, content
+            
+        # Most files have neither, so one search over the whole file saves
+        # running the patterns on every line
+        has_console = 'console.' in content
+        has_todo = todo_pattern.search(todo_text) is not None
+        
+        lines = content.split('\n')
+        todo_lines = todo_text.split('\n') if has_todo else lines
+        for line_num, (line, todo_line) in enumerate(zip(lines, todo_lines), 1):
+            if has_console and _CONSOLE_RE.search(line):
+                # Skip if it's commented out
+                stripped = line.strip()
+                if not stripped.startswith('//') and not stripped.startswith('*'):
+                    console_logs.append(f"line {line_num}")
+                    
+            if has_todo and todo_pattern.search(todo_line):
+                todos.append(f"line {line_num}")
+                
+            # Stripping only shortens a line, so most lines need no strip
+            if len(line) > max_length:
+                length = len(line.rstrip())
+                if length > max_length:
+                    long_lines.append(f"line {line_num} ({length} chars)")
+                
         return {
-            'issues': len(long_lines),
-            'locations': long_lines
+            'console_logs': {'issues': len(console_logs), 'locations': console_logs},
+            'todos': {'issues': len(todos), 'locations': todos},
+            'long_lines': {'issues': len(long_lines), 'locations': long_lines},
         }
     
     def _check_function_size(self, file_path: Path, max_lines: int = 50) -> Dict[str, Any]:
@@ -229,8 +289,10 @@ class CodeAnalyzer:
         large_functions = []
         
         try:
-            with open(file_path, 'r') as f:
-                lines = f.readlines()
+            # Same lines as readlines(), minus the line endings
+            lines = read_source(file_path).split('\n')
+            if not lines[-1]:
+                lines.pop()
                 
             # Find function declarations
             i = 0
@@ -238,12 +300,10 @@ class CodeAnalyzer:
                 line = lines[i].strip()
                 
                 # Check if this is a function declaration
-                if (re.match(r'(?:export\s+)?(?:async\s+)?function\s+\w+', line) or
-                    re.match(r'(?:const|let|var)\s+\w+\s*=\s*(?:async\s*)?\([^)]*\)\s*=>', line) or
-                    re.match(r'\w+\s*\([^)]*\)\s*{', line)):
+                if any(pattern.match(line) for pattern in _FUNC_LINE_RES):
                     
                     func_start = i
-                    func_name = re.search(r'(?:function\s+)?(\w+)', line)
+                    func_name = _FUNC_NAME_RE.search(line)
                     func_name = func_name.group(1) if func_name else 'anonymous'
                     
                     # Find function end
@@ -374,16 +434,15 @@ class CodeAnalyzer:
             
         return {'status': 'pass', 'issues': 0, 'details': []}
     
+    def _get_issue_message(self, check: str, count: int) -> str:
+        """Get issue message for a check."""
+        return _ISSUE_MESSAGES.get(check, 'Found {count} issues').format(count=count)
+    
     def _get_pass_message(self, check: str) -> str:
         """Get pass message for a check."""
-        messages = {
-            'console_logs': 'No console.log statements',
-            'complexity': 'All functions have acceptable complexity',
-            'todos': 'No TODO comments',
-            'formatting': 'Code is properly formatted',
-            'linting': 'No linting errors',
-            'type_checking': 'No TypeScript errors',
-            'long_lines': 'All lines within length limit',
-            'large_functions': 'All functions are reasonably sized'
-        }
-        return messages.get(check, 'Check passed') 
\ No newline at end of file
+        return _PASS_MESSAGES.get(check, 'Check passed')
+
+
+def _scan_file(file_path: Path) -> Dict[str, Any]:
+    """Process pool entry point; the per-file checks only depend on the file itself."""
+    return CodeAnalyzer()._scan_file(file_path)
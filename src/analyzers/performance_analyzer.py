@@ -1,10 +1,95 @@
 """Performance analyzer for detecting potential performance issues."""
 
 import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from pathlib import Path
 from loguru import logger
 
+from ..utils.cache import ResultCache, cached_map, results_dir
+from ..utils.files import content_key, read_source
+from ..utils.lines import matching_lines
+
+
+# Only analyze TypeScript/JavaScript files
+_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx')
+
+# Checks in report order
+_CHECKS = (
+    'unnecessary_rerenders',
+    'missing_memoization',
+    'large_bundle_imports',
+    'inefficient_loops',
+    'missing_keys',
+    'sync_operations',
+    'memory_leaks',
+    'unoptimized_images',
+)
+
+# Each check's patterns are joined into one alternation, so a line is
+# searched once per check rather than once per pattern.
+
+# Props that create new values on every render
+_RERENDER_RE = re.compile('|'.join(f'(?:{p})' for p in [
+    r'style\s*=\s*\{\{',                          # Inline style objects
+    r'onClick\s*=\s*\{\s*\(\)\s*=>',             # Inline arrow functions
+    r'(?<!use)(?<!set)\w+\s*=\s*\[\]',           # Array literals as props
+    r'(?<!use)(?<!set)\w+\s*=\s*\{\}',           # Object literals as props
+]))
+
+# Expensive operations that should be memoized
+_MEMOIZATION_RE = re.compile('|'.join(f'(?:{p})' for p in [
+    r'\.filter\s*\(.*\)\.map\s*\(',               # filter().map() chains
+    r'\.sort\s*\(.*\)(?!.*useMemo)',              # Sorting without memoization
+    r'\.reduce\s*\(.*\)(?!.*useMemo)',            # Complex reduces
+    r'new Date\s*\(.*\)(?!.*useMemo)',            # Date calculations
+]))
+
+# Imports that increase bundle size
+_LARGE_IMPORT_RE = re.compile('|'.join(f'(?:{p})' for p in [
+    r'import\s+\*\s+as',                          # Import entire module
+    r'from\s+[\'"]lodash[\'"]',                   # Non-tree-shakeable lodash
+    r'from\s+[\'"]moment[\'"]',                   # Large moment.js library
+    r'import\s+\{[^}]{100,}\}',                   # Very large destructured imports
+]))
+
+# Synchronous operations that should be async
+_SYNC_RE = re.compile('|'.join(f'(?:{p})' for p in [
+    r'fs\.readFileSync',                          # Sync file operations
+    r'fs\.writeFileSync',
+    r'localStorage\.(getItem|setItem)\s*\([^)]*JSON\.parse',  # Large localStorage ops
+    r'while\s*\(.*Date\.now\(\)',                 # Busy waiting
+]))
+
+# Unoptimized images (matched case-insensitively)
+_IMAGE_RE = re.compile('|'.join(f'(?:{p})' for p in [
+    r'<img\s+.*src=.*\.(?:png|jpg|jpeg).*(?!loading)',  # Images without lazy loading
+    r'require\s*\([\'"][^\'"]*(png|jpg|jpeg)',          # Large image imports
+]), re.IGNORECASE)
+
+
+# Per-check messages; issue messages are formatted with the issue count
+_ISSUE_MESSAGES = {
+    'unnecessary_rerenders': 'Found {count} patterns causing unnecessary re-renders',
+    'missing_memoization': 'Found {count} expensive operations without memoization',
+    'large_bundle_imports': 'Found {count} imports that increase bundle size',
+    'inefficient_loops': 'Found {count} inefficient loop patterns',
+    'missing_keys': 'Found {count} list items missing keys',
+    'sync_operations': 'Found {count} synchronous operations that could block',
+    'memory_leaks': 'Found {count} potential memory leaks',
+    'unoptimized_images': 'Found {count} unoptimized images',
+}
+
+_PASS_MESSAGES = {
+    'unnecessary_rerenders': 'No unnecessary re-render patterns found',
+    'missing_memoization': 'Expensive operations are properly memoized',
+    'large_bundle_imports': 'All imports are optimized',
+    'inefficient_loops': 'Loop patterns are efficient',
+    'missing_keys': 'All list items have proper keys',
+    'sync_operations': 'No blocking synchronous operations',
+    'memory_leaks': 'No memory leak patterns detected',
+    'unoptimized_images': 'Images are properly optimized',
+}
+
 
 class PerformanceAnalyzer:
     """Analyzes code for performance issues."""
@@ -12,37 +97,30 @@ class PerformanceAnalyzer:
     def __init__(self, repo_path: str = "."):
         """Initialize analyzer with repository path."""
         self.repo_path = Path(repo_path)
+        # Per-file results, keyed by content hash so edits invalidate them and
+        # persisted so later runs of the CLI reuse them
+        self._file_cache = ResultCache(directory=results_dir(__file__))
         
     def analyze_pr_files(self, changed_files: List[str]) -> Dict[str, Any]:
         """Analyze changed files for performance issues."""
         all_results = {
-            'unnecessary_rerenders': {'status': 'pass', 'issues': 0, 'locations': []},
-            'missing_memoization': {'status': 'pass', 'issues': 0, 'locations': []},
-            'large_bundle_imports': {'status': 'pass', 'issues': 0, 'locations': []},
-            'inefficient_loops': {'status': 'pass', 'issues': 0, 'locations': []},
-            'missing_keys': {'status': 'pass', 'issues': 0, 'locations': []},
-            'sync_operations': {'status': 'pass', 'issues': 0, 'locations': []},
-            'memory_leaks': {'status': 'pass', 'issues': 0, 'locations': []},
-            'unoptimized_images': {'status': 'pass', 'issues': 0, 'locations': []},
+            check: {'status': 'pass', 'issues': 0, 'locations': []} for check in _CHECKS
         }
         
-        for file in changed_files:
-            if not self._should_analyze_file(file):
-                continue
-                
-            file_path = self.repo_path / file
-            if not file_path.exists():
-                continue
-                
-            # Run performance checks
-            file_results = self._analyze_file(file_path)
-            
+        files = [
+            file for file in changed_files
+            if self._should_analyze_file(file) and (self.repo_path / file).exists()
+        ]
+        
+        # Run performance checks
+        file_paths = [self.repo_path / file for file in files]
+        for file, file_results in zip(files, self._analyze_files(file_paths)):
             # Aggregate results
             for check, result in file_results.items():
                 if result['issues'] > 0:
                     all_results[check]['issues'] += result['issues']
                     all_results[check]['locations'].extend(
-                        [f"{file}:{loc}" for loc in result['locations']]
+                        f"{file}:{loc}" for loc in result['locations']
                     )
         
         # Update statuses and messages
@@ -57,27 +135,33 @@ class PerformanceAnalyzer:
     
     def _should_analyze_file(self, file_path: str) -> bool:
         """Check if file should be analyzed."""
-        extensions = ['.ts', '.tsx', '.js', '.jsx']
-        return any(file_path.endswith(ext) for ext in extensions)
+        return file_path.endswith(_EXTENSIONS)
     
     def _analyze_file(self, file_path: Path) -> Dict[str, Any]:
         """Analyze a single file for performance issues."""
+        return self._analyze_files([file_path])[0]
+    
+    def _analyze_files(self, file_paths: List[Path]) -> List[Dict[str, Any]]:
+        """Analyze several files, spreading uncached ones over worker processes."""
+        return cached_map(self._file_cache, content_key, _scan_file, file_paths)
+    
+    def _scan_file(self, file_path: Path) -> Dict[str, Any]:
+        """Run all per-file checks, bypassing the cache."""
         results = {}
         
         try:
-            with open(file_path, 'r') as f:
-                content = f.read()
-                lines = content.split('\n')
+            content = read_source(file_path)
+            lines = content.split('\n')
                 
             # Check if it's a React component file
             is_react_file = 'import React' in content or 'from \'react\'' in content
             
             results['unnecessary_rerenders'] = self._check_unnecessary_rerenders(lines, is_react_file)
-            results['missing_memoization'] = self._check_missing_memoization(lines, is_react_file)
-            results['large_bundle_imports'] = self._check_large_imports(lines)
+            results['missing_memoization'] = self._check_missing_memoization(lines, is_react_file, content)
+            results['large_bundle_imports'] = self._check_large_imports(lines, content)
             results['inefficient_loops'] = self._check_inefficient_loops(lines)
             results['missing_keys'] = self._check_missing_keys(lines, is_react_file)
-            results['sync_operations'] = self._check_sync_operations(lines)
+            results['sync_operations'] = self._check_sync_operations(lines, content)
             results['memory_leaks'] = self._check_memory_leaks(lines)
             results['unoptimized_images'] = self._check_unoptimized_images(lines)
             
@@ -91,64 +175,42 @@ class PerformanceAnalyzer:
         if not is_react_file:
             return {'issues': 0, 'locations': []}
             
-        patterns = [
-            r'style\s*=\s*\{\{',                          # Inline style objects
-            r'onClick\s*=\s*\{\s*\(\)\s*=>',             # Inline arrow functions
-            r'(?<!use)(?<!set)\w+\s*=\s*\[\]',           # Array literals as props
-            r'(?<!use)(?<!set)\w+\s*=\s*\{\}',           # Object literals as props
-        ]
-        
         locations = []
         for i, line in enumerate(lines, 1):
+            # Every pattern needs an '=', which most lines lack, and ruling
+            # them out first is far cheaper than the regex
+            if '=' not in line:
+                continue
+
             # Skip if in useEffect, useMemo, useCallback
             if 'useEffect' in line or 'useMemo' in line or 'useCallback' in line:
                 continue
                 
-            for pattern in patterns:
-                if re.search(pattern, line):
-                    locations.append(f"line {i}")
-                    break
+            if _RERENDER_RE.search(line):
+                locations.append(f"line {i}")
                     
         return {'issues': len(locations), 'locations': locations}
     
-    def _check_missing_memoization(self, lines: List[str], is_react_file: bool) -> Dict[str, Any]:
+    def _check_missing_memoization(
+        self, lines: List[str], is_react_file: bool, text: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Check for expensive operations that should be memoized."""
         if not is_react_file:
             return {'issues': 0, 'locations': []}
             
-        patterns = [
-            r'\.filter\s*\(.*\)\.map\s*\(',               # filter().map() chains
-            r'\.sort\s*\(.*\)(?!.*useMemo)',              # Sorting without memoization
-            r'\.reduce\s*\(.*\)(?!.*useMemo)',            # Complex reduces
-            r'new Date\s*\(.*\)(?!.*useMemo)',            # Date calculations
-        ]
-        
         locations = []
-        for i, line in enumerate(lines, 1):
-            for pattern in patterns:
-                if re.search(pattern, line):
-                    # Check if it's inside a component (rough heuristic)
-                    if any(keyword in lines[max(0, i-10):i] for keyword in ['function', 'const', '=>']):
-                        locations.append(f"line {i}")
-                        break
-                        
+        for i, line in matching_lines(_MEMOIZATION_RE, lines, text):
+            # Check if it's inside a component (rough heuristic)
+            if any(keyword in lines[max(0, i-10):i] for keyword in ['function', 'const', '=>']):
+                locations.append(f"line {i}")
+
         return {'issues': len(locations), 'locations': locations}
     
-    def _check_large_imports(self, lines: List[str]) -> Dict[str, Any]:
+    def _check_large_imports(self, lines: List[str], text: Optional[str] = None) -> Dict[str, Any]:
         """Check for imports that increase bundle size."""
-        patterns = [
-            r'import\s+\*\s+as',                          # Import entire module
-            r'from\s+[\'"]lodash[\'"]',                   # Non-tree-shakeable lodash
-            r'from\s+[\'"]moment[\'"]',                   # Large moment.js library
-            r'import\s+\{[^}]{100,}\}',                   # Very large destructured imports
-        ]
-        
         locations = []
-        for i, line in enumerate(lines, 1):
-            for pattern in patterns:
-                if re.search(pattern, line):
-                    locations.append(f"line {i}")
-                    break
+        for i, _ in matching_lines(_LARGE_IMPORT_RE, lines, text):
+            locations.append(f"line {i}")
                     
         return {'issues': len(locations), 'locations': locations}
     
@@ -158,15 +220,15 @@ class PerformanceAnalyzer:
         
         for i, line in enumerate(lines, 1):
             # Nested array methods
-            if '.map(' in line and any(method in line for method in ['.filter(', '.find(', '.forEach(']):
+            if '.map(' in line and ('.filter(' in line or '.find(' in line or '.forEach(' in line):
                 if line.count('(') - line.count(')') > 2:  # Rough nesting check
                     locations.append(f"line {i} - nested array methods")
                     
             # Array operations in loops
             if 'for' in line or 'while' in line:
                 # Look ahead for array operations
-                for j in range(i, min(i + 10, len(lines))):
-                    if any(op in lines[j] for op in ['.push(', '.unshift(', '.splice(']):
+                for j, text in enumerate(lines[i:i + 10], i):
+                    if '.push(' in text or '.unshift(' in text or '.splice(' in text:
                         locations.append(f"line {j} - array mutation in loop")
                         break
                         
@@ -200,21 +262,11 @@ class PerformanceAnalyzer:
                     
         return {'issues': len(locations), 'locations': locations}
     
-    def _check_sync_operations(self, lines: List[str]) -> Dict[str, Any]:
+    def _check_sync_operations(self, lines: List[str], text: Optional[str] = None) -> Dict[str, Any]:
         """Check for synchronous operations that should be async."""
-        patterns = [
-            r'fs\.readFileSync',                          # Sync file operations
-            r'fs\.writeFileSync',
-            r'localStorage\.(getItem|setItem)\s*\([^)]*JSON\.parse',  # Large localStorage ops
-            r'while\s*\(.*Date\.now\(\)',                 # Busy waiting
-        ]
-        
         locations = []
-        for i, line in enumerate(lines, 1):
-            for pattern in patterns:
-                if re.search(pattern, line):
-                    locations.append(f"line {i}")
-                    break
+        for i, _ in matching_lines(_SYNC_RE, lines, text):
+            locations.append(f"line {i}")
                     
         return {'issues': len(locations), 'locations': locations}
     
@@ -222,79 +274,54 @@ class PerformanceAnalyzer:
         """Check for potential memory leaks."""
         locations = []
         
-        # Track event listeners and intervals
-        add_listener_lines = []
-        set_interval_lines = []
+        # Track event listeners and intervals not yet cleaned up
+        has_listener = False
+        has_timer = False
         
         for i, line in enumerate(lines, 1):
             # Event listeners without cleanup
             if 'addEventListener' in line:
-                add_listener_lines.append(i)
+                has_listener = True
             elif 'removeEventListener' in line:
-                add_listener_lines = []  # Reset if we find cleanup
+                has_listener = False  # Reset if we find cleanup
                 
             # Timers without cleanup
             if 'setInterval' in line or 'setTimeout' in line:
-                set_interval_lines.append(i)
+                has_timer = True
             elif 'clearInterval' in line or 'clearTimeout' in line:
-                set_interval_lines = []  # Reset if we find cleanup
+                has_timer = False  # Reset if we find cleanup
                 
-            # Check for cleanup in useEffect
-            if 'useEffect' in line:
+            # Check for cleanup in useEffect, only needed if something is
+            # left to clean up
+            if 'useEffect' in line and (has_listener or has_timer):
                 # Look for return cleanup function
-                has_cleanup = False
-                for j in range(i, min(i + 20, len(lines))):
-                    if 'return' in lines[j] and '=>' in lines[j]:
-                        has_cleanup = True
-                        break
+                has_cleanup = any('return' in text and '=>' in text for text in lines[i:i + 20])
                         
-                if not has_cleanup and (add_listener_lines or set_interval_lines):
+                if not has_cleanup:
                     locations.append(f"line {i} - useEffect without cleanup")
                     
         return {'issues': len(locations), 'locations': locations}
     
     def _check_unoptimized_images(self, lines: List[str]) -> Dict[str, Any]:
         """Check for unoptimized image usage."""
-        patterns = [
-            r'<img\s+.*src=.*\.(?:png|jpg|jpeg).*(?!loading)',  # Images without lazy loading
-            r'require\s*\([\'"][^\'"]*(png|jpg|jpeg)',          # Large image imports
-        ]
-        
         locations = []
         for i, line in enumerate(lines, 1):
-            for pattern in patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    # Check if it's missing optimization attributes
-                    if 'loading=' not in line and 'Image' not in line:  # Not using Next.js Image
-                        locations.append(f"line {i}")
-                        break
+            if _IMAGE_RE.search(line):
+                # Check if it's missing optimization attributes
+                if 'loading=' not in line and 'Image' not in line:  # Not using Next.js Image
+                    locations.append(f"line {i}")
                         
         return {'issues': len(locations), 'locations': locations}
     
     def _get_issue_message(self, check: str, count: int) -> str:
         """Get issue message for a performance check."""
-        messages = {
-            'unnecessary_rerenders': f'Found {count} patterns causing unnecessary re-renders',
-            'missing_memoization': f'Found {count} expensive operations without memoization',
-            'large_bundle_imports': f'Found {count} imports that increase bundle size',
-            'inefficient_loops': f'Found {count} inefficient loop patterns',
-            'missing_keys': f'Found {count} list items missing keys',
-            'sync_operations': f'Found {count} synchronous operations that could block',
-            'memory_leaks': f'Found {count} potential memory leaks',
-            'unoptimized_images': f'Found {count} unoptimized images',
-        }
-        return messages.get(check, f'Found {count} performance issues')
+        return _ISSUE_MESSAGES.get(check, 'Found {count} performance issues').format(count=count)
     
     def _get_pass_message(self, check: str) -> str:
         """Get pass message for a performance check."""
-        messages = {
-            'unnecessary_rerenders': 'No unnecessary re-render patterns found',
-            'missing_memoization': 'Expensive operations are properly memoized',
-            'large_bundle_imports': 'All imports are optimized',
-            'inefficient_loops': 'Loop patterns are efficient',
-            'missing_keys': 'All list items have proper keys',
-            'sync_operations': 'No blocking synchronous operations',
-            'memory_leaks': 'No memory leak patterns detected',
-            'unoptimized_images': 'Images are properly optimized',
-        }
-        return messages.get(check, 'Performance check passed') 
\ No newline at end of file
+        return _PASS_MESSAGES.get(check, 'Performance check passed')
+
+
+def _scan_file(file_path: Path) -> Dict[str, Any]:
+    """Process pool entry point; the per-file checks only depend on the file itself."""
+    return PerformanceAnalyzer()._scan_file(file_path)
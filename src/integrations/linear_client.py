@@ -1,6 +1,6 @@
 """Linear API client for task management."""
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 import requests
 from loguru import logger
 
@@ -15,6 +15,10 @@ class LinearClient:
         self.api_key = api_key
         self.team_id = team_id
         self.base_url = "https://api.linear.app/graphql"
+        # Team workflow states and labels rarely change, so they are fetched
+        # once per client instead of once per create/update call.
+        self._state_ids: Optional[Dict[str, str]] = None
+        self._label_ids: Optional[Dict[str, str]] = None
         logger.debug(f"Initialized Linear client for team {team_id}")
     
     def get_ready_tasks(self, state: str = "Ready for Dev") -> List[LinearTask]:
@@ -195,6 +199,12 @@ class LinearClient:
     
     def _get_state_id(self, state_name: str) -> Optional[str]:
         """Get state ID from state name."""
+        if self._state_ids is None:
+            self._state_ids = self._fetch_state_ids()
+        return (self._state_ids or {}).get(state_name)
+    
+    def _fetch_state_ids(self) -> Optional[Dict[str, str]]:
+        """Fetch a name -> ID map of the team's workflow states."""
         query = """
         query($teamId: ID!) {
             workflowStates(
@@ -217,13 +227,20 @@ class LinearClient:
             response.raise_for_status()
             
             data = response.json()
+            
+            # An error body is a failed lookup, not an empty one, so it is
+            # retried rather than cached
+            if "errors" in data or not data.get("data"):
+                logger.error(f"Failed to get workflow states: {data.get('errors')}")
+                return None
+            
             states = data.get("data", {}).get("workflowStates", {}).get("nodes", [])
             
+            state_ids: Dict[str, str] = {}
             for state in states:
-                if state["name"] == state_name:
-                    return state["id"]
-                    
-            return None
+                # Keep the first match, as the original linear lookup did
+                state_ids.setdefault(state["name"], state["id"])
+            return state_ids
             
         except Exception as e:
             logger.error(f"Error getting state ID: {e}")
@@ -231,6 +248,13 @@ class LinearClient:
     
     def _get_label_ids(self, label_names: List[str]) -> List[str]:
         """Get label IDs from label names."""
+        if self._label_ids is None:
+            self._label_ids = self._fetch_label_ids()
+        all_labels = self._label_ids or {}
+        return [all_labels[name] for name in label_names if name in all_labels]
+    
+    def _fetch_label_ids(self) -> Optional[Dict[str, str]]:
+        """Fetch a name -> ID map of the team's issue labels."""
         query = """
         query($teamId: ID!) {
             issueLabels(
@@ -253,20 +277,21 @@ class LinearClient:
             response.raise_for_status()
             
             data = response.json()
+            
+            if "errors" in data or not data.get("data"):
+                logger.error(f"Failed to get label IDs: {data.get('errors')}")
+                return None
+            
             all_labels = data.get("data", {}).get("issueLabels", {}).get("nodes", [])
             
-            label_ids = []
-            for label_name in label_names:
-                for label in all_labels:
-                    if label["name"] == label_name:
-                        label_ids.append(label["id"])
-                        break
-                        
+            label_ids: Dict[str, str] = {}
+            for label in all_labels:
+                label_ids.setdefault(label["name"], label["id"])
             return label_ids
             
         except Exception as e:
             logger.error(f"Error getting label IDs: {e}")
-            return []
+            return None
     
     def _update_task_state(self, task_id: str, state_id: str) -> bool:
         """Update task state."""
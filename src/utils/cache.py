@@ -0,0 +1,203 @@
+"""Caching helpers shared by the analyzers"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+from loguru import logger
+
+from .parallel import map_files
+
+
+@lru_cache(maxsize=None)
+def _source_digest(module_file: str) -> str:
+    """Hash an analyzer module together with the shared helpers it uses."""
+    digest = hashlib.sha256(Path(module_file).read_bytes())
+    for helper in sorted(Path(__file__).parent.glob('*.py')):
+        digest.update(helper.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+@lru_cache(maxsize=None)
+def _remove_stale_dirs(directory: Path) -> None:
+    """Delete the results other versions of the same analyzer left behind."""
+    module, _, _ = directory.name.rpartition('-')
+    pattern = re.compile(re.escape(module) + '-[0-9a-f]{16}')
+    try:
+        siblings = list(directory.parent.iterdir())
+    except OSError:
+        return
+    for sibling in siblings:
+        if sibling != directory and pattern.fullmatch(sibling.name) and sibling.is_dir():
+            shutil.rmtree(sibling, ignore_errors=True)
+
+
+def results_dir(module_file: str) -> Optional[Path]:
+    """Get the directory where an analyzer keeps its results between runs.
+
+    This is a subdirectory of $CURSOR_TOOLKIT_CACHE_DIR, which defaults to
+    cursor-toolkit in the user cache directory, named after the analyzer
+    module and a hash of its source, so results computed by an older version
+    of the rules are never reused; directories of other versions are deleted.
+    Returns None when persistence is disabled by setting
+    CURSOR_TOOLKIT_CACHE_DIR to an empty value.
+    """
+    root = os.environ.get('CURSOR_TOOLKIT_CACHE_DIR')
+    if root is None:
+        user_cache = os.environ.get('XDG_CACHE_HOME') or os.path.join('~', '.cache')
+        root = os.path.join(user_cache, 'cursor-toolkit')
+    if not root:
+        return None
+
+    try:
+        digest = _source_digest(module_file)
+    except OSError:
+        return None
+    directory = Path(root).expanduser() / f"{Path(module_file).stem}-{digest}"
+    _remove_stale_dirs(directory)
+    return directory
+
+
+class ResultCache:
+    """Bounded LRU cache for per-file analysis results.
+
+    Given a directory, results are also written there as JSON so later runs
+    can reuse them. Keys must then be strings that are valid file names, such
+    as content hashes, and values must survive a JSON round trip. The
+    directory is bounded by max_entries too, dropping the files read or
+    written least recently.
+    """
+
+    def __init__(self, max_entries: int = 512, directory: Optional[Path] = None):
+        """Initialize an empty cache holding at most max_entries results."""
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        # Files in the directory, counted on the first write
+        self._stored: Optional[int] = None
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached result, or None if the key is unknown."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        value = self._load(key)
+        if value is not None:
+            self._remember(key, value)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a result in memory and, if there is a directory, on disk."""
+        self._remember(key, value)
+        self._store(key, value)
+
+    def _remember(self, key: Hashable, value: Any) -> None:
+        """Keep a result in memory, evicting the least recently used one if full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: Hashable) -> Optional[Any]:
+        """Read a result stored by an earlier run, or None if there is none."""
+        if self.directory is None:
+            return None
+        path = self.directory / f"{key}.json"
+        try:
+            with open(path, 'r') as f:
+                value = json.load(f)
+            # Mark the entry as recently used, so eviction keeps it
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        """Write a result for later runs; failures only cost a rescan."""
+        if self.directory is None:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so concurrent runs never read
+            # a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(value, f)
+                os.replace(tmp_path, self.directory / f"{key}.json")
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+            if self._stored is None:
+                self._stored = len(list(self.directory.glob('*.json')))
+            else:
+                self._stored += 1
+            if self._stored > self.max_entries:
+                self._evict_stored(self.directory)
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug(f"Could not persist cached result: {e}")
+
+    def _evict_stored(self, directory: Path) -> None:
+        """Delete the least recently used files once there are too many."""
+        entries = []
+        for path in directory.glob('*.json'):
+            try:
+                entries.append((path.stat().st_mtime_ns, path))
+            except OSError:
+                pass  # Evicted by a concurrent run
+
+        # Evict down to three quarters of the limit, so the directory is not
+        # listed again on every following write
+        entries.sort()
+        excess = max(0, len(entries) - self.max_entries * 3 // 4)
+        for _, path in entries[:excess]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        self._stored = len(entries) - excess
+
+
+def cached_map(
+    cache: ResultCache,
+    key_fn: Callable[[Path], Hashable],
+    worker: Callable[[Path], Dict[str, Any]],
+    file_paths: Sequence[Path],
+) -> List[Dict[str, Any]]:
+    """Apply worker to every file, reusing results cached under key_fn(file).
+
+    Files missing from the cache are scanned with map_files, so large batches
+    use worker processes. Their results are cached here rather than in the
+    workers, whose caches would be lost when the pool shuts down. Files whose
+    key cannot be computed are always scanned, and empty results, which the
+    analyzers return when a scan fails, are never cached.
+    """
+    keys: List[Optional[Hashable]] = []
+    for file_path in file_paths:
+        try:
+            keys.append(key_fn(file_path))
+        except (OSError, ValueError):
+            keys.append(None)
+
+    cached: List[Optional[Dict[str, Any]]] = [
+        None if key is None else cache.get(key) for key in keys
+    ]
+    pending = [file_path for file_path, result in zip(file_paths, cached) if result is None]
+    scanned = iter(map_files(worker, pending))
+
+    results: List[Dict[str, Any]] = []
+    for key, result in zip(keys, cached):
+        if result is None:
+            result = next(scanned)
+            if key is not None and result:
+                cache.set(key, result)
+        results.append(result)
+    return results
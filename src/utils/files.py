@@ -0,0 +1,34 @@
+"""File helpers shared by the analyzers"""
+import hashlib
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Tuple, Union
+
+
+@lru_cache(maxsize=128)
+def _read_text(path: str, mtime_ns: int, size: int) -> str:
+    """Read and decode a file; mtime and size only serve as cache key."""
+    with open(path, 'r') as f:
+        return f.read()
+
+
+def stat_key(file_path: Union[str, Path]) -> Tuple[str, int, int]:
+    """Get a (path, mtime_ns, size) key that changes whenever the file does."""
+    stat = os.stat(file_path)
+    return str(file_path), stat.st_mtime_ns, stat.st_size
+
+
+def read_source(file_path: Union[str, Path]) -> str:
+    """Read a source file's text.
+
+    Every analyzer reads the same changed files, so the decoded content is
+    cached per (path, mtime, size) and only hits the disk once per process
+    until the file changes.
+    """
+    return _read_text(*stat_key(file_path))
+
+
+def content_key(file_path: Union[str, Path]) -> str:
+    """Get a SHA-256 digest of a source file's text, for caching by content."""
+    return hashlib.sha256(read_source(file_path).encode()).hexdigest()
@@ -0,0 +1,36 @@
+"""Line-oriented pattern matching shared by the analyzers"""
+from typing import Iterator, List, Optional, Pattern, Tuple
+
+
+def matching_lines(
+    pattern: Pattern[str], lines: List[str], text: Optional[str] = None
+) -> Iterator[Tuple[int, str]]:
+    """Yield (line number, line) for every line the pattern matches.
+
+    The pattern is searched over the joined text to jump straight to the next
+    candidate line, which is then re-checked on its own. Any match within a
+    line is also a match in the joined text, so this finds exactly the lines a
+    per-line search would, as long as the pattern has no ^, $, \\A or \\Z
+    anchors. Lines without a match are skipped without a Python-level loop.
+
+    text must be the lines joined with newlines. Callers that already hold
+    the file content should pass it, so it is not rebuilt for every pattern.
+    """
+    if text is None:
+        text = '\n'.join(lines)
+    line_num, pos = 1, 0
+    while True:
+        match = pattern.search(text, pos)
+        if match is None:
+            return
+        line_num += text.count('\n', pos, match.start())
+        line = lines[line_num - 1]
+        if pattern.search(line):
+            yield line_num, line
+
+        # Resume at the start of the next line, so a match that spilled
+        # across a newline cannot hide a real one on the lines it covered
+        pos = text.find('\n', match.start()) + 1
+        if not pos:
+            return
+        line_num += 1
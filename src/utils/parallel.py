@@ -0,0 +1,65 @@
+"""Helpers for spreading per-file analysis over several processes"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.context import BaseContext
+from pathlib import Path
+from typing import Callable, List, Sequence, TypeVar
+
+from loguru import logger
+
+R = TypeVar('R')
+
+# Scanning takes roughly 80-200 ms per MiB of source. The first pool in a
+# process also starts the fork server (about 150 ms), later ones cost about
+# 15 ms, so smaller batches are analyzed in this process
+MIN_PARALLEL_BYTES = 1 << 20
+
+# Callers may have other threads running (the analyzer demo runs all four
+# analyzers at once), and forking such a process can deadlock on a lock one
+# of them holds, so workers come from a fork server, or are spawned where
+# there is none
+_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+def _total_size(file_paths: Sequence[Path]) -> int:
+    """Sum the sizes of the files, skipping any that cannot be read."""
+    total = 0
+    for file_path in file_paths:
+        try:
+            total += os.path.getsize(file_path)
+        except OSError:
+            pass
+    return total
+
+
+def _pool_context(worker: Callable[[Path], R]) -> BaseContext:
+    """Get the multiprocessing context for a pool running worker."""
+    context = multiprocessing.get_context(_START_METHOD)
+    if _START_METHOD == 'forkserver':
+        # Importing the worker's module once in the fork server saves every
+        # later pool from importing it again; this only takes effect when
+        # the server starts, with the first pool
+        context.set_forkserver_preload([worker.__module__])
+    return context
+
+
+def map_files(worker: Callable[[Path], R], file_paths: Sequence[Path]) -> List[R]:
+    """Apply worker to every file, using a process pool for large batches.
+
+    The worker must be a module-level function so it can be pickled. Results
+    come back in the order of file_paths. If a pool cannot be started, the
+    files are processed in this process instead.
+    """
+    workers = min(len(file_paths), os.cpu_count() or 1)
+    if workers < 2 or _total_size(file_paths) < MIN_PARALLEL_BYTES:
+        return [worker(file_path) for file_path in file_paths]
+
+    # A few chunks per worker keeps them busy without per-file IPC overhead
+    chunksize = max(1, len(file_paths) // (workers * 4))
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context(worker)) as executor:
+            return list(executor.map(worker, file_paths, chunksize=chunksize))
+    except (OSError, RuntimeError) as e:
+        logger.warning(f"Process pool unavailable, analyzing sequentially: {e}")
+        return [worker(file_path) for file_path in file_paths]
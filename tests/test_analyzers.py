@@ -1,11 +1,58 @@
 """Tests for code analyzers."""
 
+import os
+import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 from src.analyzers import CodeAnalyzer, SecurityAnalyzer, PerformanceAnalyzer, AccessibilityAnalyzer
+from src.analyzers import code_analyzer
+from src.utils.cache import ResultCache, results_dir
+from src.utils.files import read_source
 
+_cache_dir = tempfile.TemporaryDirectory()
+_cache_env = patch.dict(os.environ, {'CURSOR_TOOLKIT_CACHE_DIR': _cache_dir.name})
 
-class TestCodeAnalyzer(unittest.TestCase):
+
+def setUpModule():
+    """Keep results persisted by the analyzers out of the user's cache."""
+    _cache_env.start()
+
+
+def tearDownModule():
+    """Restore the environment and drop the persisted results."""
+    _cache_env.stop()
+    _cache_dir.cleanup()
+
+
+class CachedResultsMixin:
+    """Result cache tests shared by the analyzer test cases.
+
+    Test cases set self.analyzer and self.test_file in setUp.
+    """
+    
+    def _analyze(self, analyzer):
+        """Analyze the sample file with the given analyzer."""
+        return analyzer._analyze_files([self.test_file])[0]
+        
+    def test_unchanged_file_served_from_cache(self):
+        """Test that re-analyzing unchanged content skips the checks."""
+        first = self._analyze(self.analyzer)
+        with patch.object(type(self.analyzer), '_scan_file') as mock_scan:
+            second = self._analyze(self.analyzer)
+        mock_scan.assert_not_called()
+        self.assertEqual(first, second)
+        
+    def test_results_persist_across_instances(self):
+        """Test that a new analyzer reuses results stored by an earlier one."""
+        first = self._analyze(self.analyzer)
+        with patch.object(type(self.analyzer), '_scan_file') as mock_scan:
+            second = self._analyze(type(self.analyzer)())
+        mock_scan.assert_not_called()
+        self.assertEqual(first, second)
+
+
+class TestCodeAnalyzer(CachedResultsMixin, unittest.TestCase):
     """Test code analyzer functionality."""
     
     def setUp(self):
@@ -45,7 +92,7 @@ class TestCodeAnalyzer(unittest.TestCase):
         self.assertEqual(results['issues'], 1)  # We know there's 1 large function
 
 
-class TestSecurityAnalyzer(unittest.TestCase):
+class TestSecurityAnalyzer(CachedResultsMixin, unittest.TestCase):
     """Test security analyzer functionality."""
     
     def setUp(self):
@@ -66,7 +113,13 @@ class TestSecurityAnalyzer(unittest.TestCase):
             lines = f.read().split('\n')
         results = self.analyzer._check_xss(lines)
         self.assertGreater(results['issues'], 0)
-        
+
+    def test_xss_detection_is_per_line(self):
+        """Test that a pattern spanning two lines is not reported."""
+        lines = ["$('#a').html(", "  header ${title}", "el.html(`${body}`)"]
+        results = self.analyzer._check_xss(lines)
+        self.assertEqual(results['locations'], ['line 3'])
+
     def test_eval_detection(self):
         """Test eval usage detection."""
         with open(self.test_file, 'r') as f:
@@ -82,7 +135,7 @@ class TestSecurityAnalyzer(unittest.TestCase):
         self.assertGreater(results['issues'], 0)
 
 
-class TestPerformanceAnalyzer(unittest.TestCase):
+class TestPerformanceAnalyzer(CachedResultsMixin, unittest.TestCase):
     """Test performance analyzer functionality."""
     
     def setUp(self):
@@ -105,7 +158,7 @@ class TestPerformanceAnalyzer(unittest.TestCase):
         self.assertGreater(results['issues'], 0)
 
 
-class TestAccessibilityAnalyzer(unittest.TestCase):
+class TestAccessibilityAnalyzer(CachedResultsMixin, unittest.TestCase):
     """Test accessibility analyzer functionality."""
     
     def setUp(self):
@@ -133,6 +186,90 @@ class TestAccessibilityAnalyzer(unittest.TestCase):
             lines = f.read().split('\n')
         results = self.analyzer._check_interactive_elements(lines)
         self.assertGreater(results['issues'], 0)
+        
+    def test_parallel_results_match_sequential(self):
+        """Test that analyzing files in a process pool keeps results and order."""
+        files = ['test_samples/sample_code.tsx', 'missing.tsx', 'test_samples/sample_code.tsx']
+        expected = AccessibilityAnalyzer().analyze_pr_files(files)
+        with patch('src.utils.parallel.MIN_PARALLEL_BYTES', 0), \
+                patch('src.utils.parallel.os.cpu_count', return_value=2):
+            results = AccessibilityAnalyzer().analyze_pr_files(files)
+        self.assertEqual(results, expected)
+
+
+class TestReadSource(unittest.TestCase):
+    """Test the shared source reader."""
+    
+    def test_reread_after_change(self):
+        """Test that a modified file is not served from the cache."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'component.tsx'
+            path.write_text('const a = 1;\n')
+            self.assertEqual(read_source(path), 'const a = 1;\n')
+            
+            path.write_text('const b = 22;\n')
+            os.utime(path, ns=(0, 1))
+            self.assertEqual(read_source(path), 'const b = 22;\n')
+
+
+class TestResultCache(unittest.TestCase):
+    """Test the on-disk side of the result cache."""
+    
+    def setUp(self):
+        """Set up a scratch cache directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.directory = Path(self.tmp.name) / 'results'
+        
+    def _store(self, cache, key, mtime):
+        """Store a result and date its file, to order evictions."""
+        cache.set(key, {'key': key})
+        os.utime(self.directory / f'{key}.json', ns=(mtime, mtime))
+        
+    def test_stored_files_are_capped(self):
+        """Test that the least recently used files are evicted past the cap."""
+        cache = ResultCache(max_entries=4, directory=self.directory)
+        for mtime, key in enumerate(['a', 'b', 'c', 'd'], 1):
+            self._store(cache, key, mtime)
+            
+        # A hit from a later run marks the entry as recently used
+        self.assertEqual(ResultCache(directory=self.directory).get('a'), {'key': 'a'})
+        self._store(cache, 'e', 5)
+        
+        stored = sorted(path.stem for path in self.directory.glob('*.json'))
+        self.assertLessEqual(len(stored), 4)
+        self.assertIn('a', stored)
+        self.assertIn('e', stored)
+        self.assertNotIn('b', stored)
+        
+    def test_other_versions_are_removed(self):
+        """Test that results of a changed analyzer are deleted."""
+        root = Path(self.tmp.name)
+        stale = root / 'code_analyzer-0123456789abcdef'
+        stale.mkdir()
+        (stale / 'entry.json').write_text('{}')
+        unrelated = root / 'code_analyzer-notes'
+        unrelated.mkdir()
+        
+        with patch.dict(os.environ, {'CURSOR_TOOLKIT_CACHE_DIR': self.tmp.name}):
+            current = results_dir(code_analyzer.__file__)
+        self.assertEqual(current.parent, root)
+        self.assertFalse(stale.exists())
+        self.assertTrue(unrelated.exists())
+        
+    def test_analyzers_keep_each_others_results(self):
+        """Test that analyzers sharing the cache root only prune their own versions."""
+        root = Path(self.tmp.name)
+        stale = root / 'performance_analyzer-0123456789abcdef'
+        stale.mkdir()
+        
+        with patch.dict(os.environ, {'CURSOR_TOOLKIT_CACHE_DIR': self.tmp.name}):
+            security = SecurityAnalyzer()
+            security._analyze_file(Path('test_samples/sample_code.tsx'))
+            performance = PerformanceAnalyzer()
+        self.assertFalse(stale.exists())
+        self.assertNotEqual(performance._file_cache.directory, security._file_cache.directory)
+        self.assertEqual(len(list(security._file_cache.directory.glob('*.json'))), 1)
 
 
 if __name__ == '__main__':
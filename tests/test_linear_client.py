@@ -308,4 +308,174 @@ class TestLinearClient:
         # Try to update with non-existent state
         result = linear_client.update_task('KEY-100', state='Invalid State')
         
-        assert result is False  # Should fail gracefully 
\ No newline at end of file
+        assert result is False  # Should fail gracefully
+
+    def test_workflow_states_fetched_once(self, linear_client, mock_linear_api):
+        """Test that repeated updates reuse the workflow state lookup."""
+        mock_response_states = Mock()
+        mock_response_states.json.return_value = {
+            'data': {
+                'workflowStates': {
+                    'nodes': [
+                        {'id': 'state-1', 'name': 'Ready for Dev'},
+                        {'id': 'state-2', 'name': 'In Progress'}
+                    ]
+                }
+            }
+        }
+        mock_response_states.raise_for_status = Mock()
+
+        mock_response_update = Mock()
+        mock_response_update.json.return_value = {
+            'data': {'issueUpdate': {'success': True}}
+        }
+        mock_response_update.raise_for_status = Mock()
+
+        mock_linear_api.side_effect = [
+            mock_response_states,   # Get states (first update only)
+            mock_response_update,   # Update KEY-100
+            mock_response_update    # Update KEY-101
+        ]
+
+        assert linear_client.update_task('KEY-100', state='In Progress') is True
+        assert linear_client.update_task('KEY-101', state='In Progress') is True
+        assert mock_linear_api.call_count == 3
+
+    def test_labels_fetched_once(self, linear_client, mock_linear_api):
+        """Test that repeated task creation reuses the label lookup."""
+        mock_response_states = Mock()
+        mock_response_states.json.return_value = {
+            'data': {
+                'workflowStates': {
+                    'nodes': [{'id': 'state-1', 'name': 'Ready for Dev'}]
+                }
+            }
+        }
+        mock_response_states.raise_for_status = Mock()
+
+        mock_response_labels = Mock()
+        mock_response_labels.json.return_value = {
+            'data': {
+                'issueLabels': {
+                    'nodes': [
+                        {'id': 'label-1', 'name': 'feature'},
+                        {'id': 'label-2', 'name': 'bug'}
+                    ]
+                }
+            }
+        }
+        mock_response_labels.raise_for_status = Mock()
+
+        mock_response_create = Mock()
+        mock_response_create.json.return_value = {
+            'data': {
+                'issueCreate': {
+                    'success': True,
+                    'issue': {'id': '789', 'identifier': 'KEY-102', 'title': 'New task'}
+                }
+            }
+        }
+        mock_response_create.raise_for_status = Mock()
+
+        mock_linear_api.side_effect = [
+            mock_response_states,   # Get states (first task only)
+            mock_response_labels,   # Get labels (first task only)
+            mock_response_create,   # Create first task
+            mock_response_create    # Create second task
+        ]
+
+        assert linear_client.create_task('First', labels=['bug']) == 'KEY-102'
+        assert linear_client.create_task('Second', labels=['feature']) == 'KEY-102'
+        assert mock_linear_api.call_count == 4
+        second_variables = mock_linear_api.call_args_list[3].kwargs['json']['variables']
+        assert second_variables['labelIds'] == ['label-1']
+
+    def test_state_fetch_with_errors_is_retried(self, linear_client, mock_linear_api):
+        """Test that a GraphQL error body is not cached as an empty state map."""
+        mock_response_error = Mock()
+        mock_response_error.json.return_value = {'errors': [{'message': 'Rate limited'}]}
+        mock_response_error.raise_for_status = Mock()
+
+        mock_response_states = Mock()
+        mock_response_states.json.return_value = {
+            'data': {
+                'workflowStates': {
+                    'nodes': [{'id': 'state-2', 'name': 'In Progress'}]
+                }
+            }
+        }
+        mock_response_states.raise_for_status = Mock()
+
+        mock_response_update = Mock()
+        mock_response_update.json.return_value = {
+            'data': {'issueUpdate': {'success': True}}
+        }
+        mock_response_update.raise_for_status = Mock()
+
+        mock_linear_api.side_effect = [
+            mock_response_error,    # Get states fails
+            mock_response_states,   # Get states again
+            mock_response_update    # Update KEY-100
+        ]
+
+        assert linear_client.update_task('KEY-100', state='In Progress') is False
+        assert linear_client.update_task('KEY-100', state='In Progress') is True
+        assert mock_linear_api.call_count == 3
+
+    @pytest.mark.parametrize('error_body', [None, {'errors': [{'message': 'Rate limited'}]}])
+    def test_failed_label_fetch_is_retried(self, linear_client, mock_linear_api, error_body):
+        """Test that a failed label lookup is not cached."""
+        mock_response_states = Mock()
+        mock_response_states.json.return_value = {
+            'data': {
+                'workflowStates': {
+                    'nodes': [{'id': 'state-1', 'name': 'Ready for Dev'}]
+                }
+            }
+        }
+        mock_response_states.raise_for_status = Mock()
+
+        mock_response_error = Mock()
+        if error_body is None:
+            mock_response_error.raise_for_status = Mock(side_effect=Exception('API error'))
+        else:
+            mock_response_error.json.return_value = error_body
+            mock_response_error.raise_for_status = Mock()
+
+        mock_response_labels = Mock()
+        mock_response_labels.json.return_value = {
+            'data': {
+                'issueLabels': {
+                    'nodes': [{'id': 'label-2', 'name': 'bug'}]
+                }
+            }
+        }
+        mock_response_labels.raise_for_status = Mock()
+
+        mock_response_create = Mock()
+        mock_response_create.json.return_value = {
+            'data': {
+                'issueCreate': {
+                    'success': True,
+                    'issue': {'id': '789', 'identifier': 'KEY-102', 'title': 'New task'}
+                }
+            }
+        }
+        mock_response_create.raise_for_status = Mock()
+
+        mock_linear_api.side_effect = [
+            mock_response_states,   # Get states
+            mock_response_error,    # Get labels fails
+            mock_response_create,   # Create first task without labels
+            mock_response_labels,   # Get labels again
+            mock_response_create    # Create second task
+        ]
+
+        assert linear_client.create_task('First', labels=['bug']) == 'KEY-102'
+        first_variables = mock_linear_api.call_args_list[2].kwargs['json']['variables']
+        assert 'labelIds' not in first_variables
+
+        assert linear_client.create_task('Second', labels=['bug']) == 'KEY-102'
+        assert mock_linear_api.call_count == 5
+        second_variables = mock_linear_api.call_args_list[4].kwargs['json']['variables']
+        assert second_variables['labelIds'] == ['label-2']